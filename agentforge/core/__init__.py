@@ -0,0 +1,5 @@
+from .agent import Agent
+
+__all__ = [
+    "Agent"
+] 
\ No newline at end of file
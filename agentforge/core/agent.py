@@ -1,10 +1,13 @@
-from typing import Optional, Any, Dict, List
-from threading import Thread
+from typing import Optional, Any, Dict, List, Set
+from datetime import datetime
 from uuid import uuid4
-import time
+import asyncio
 
+from apscheduler.job import Job
 from loguru import logger
 
+from . import runtime
+
 
 class Agent:
     """Base class for all AgentForge agents.
@@ -18,43 +21,81 @@ class Agent:
         self.name = name
         self.config = config or {}
         self.tasks: List[Any] = []
-        self._thread: Optional[Thread] = None
+        self._jobs: List[Job] = []
+        self._active_runs: Set[asyncio.Task] = set()
         self._running = False
         
         logger.info(f"Agent {self.name} ({self.id}) initialized")
     
     def assign_task(self, task: Any) -> None:
-        """Assign a task to this agent."""
+        """Assign a task to this agent.
+        
+        Each task runs on its own interval trigger (``task.interval_seconds``),
+        starting as soon as the agent is running.
+        """
         self.tasks.append(task)
+        if self._running:
+            self._schedule(task)
         logger.info(f"Task {task.__class__.__name__} assigned to agent {self.name}")
     
     def start(self) -> None:
-        """Start the agent in a background thread."""
+        """Start running the agent's tasks on the shared runtime."""
         if self._running:
             logger.warning(f"Agent {self.name} is already running")
             return
             
         self._running = True
-        self._thread = Thread(target=self._run_loop, daemon=True)
-        self._thread.start()
+        for task in self.tasks:
+            self._schedule(task)
         logger.info(f"Agent {self.name} started")
     
     def stop(self) -> None:
-        """Stop the agent."""
+        """Stop the agent, waiting for in-flight task runs to finish."""
+        if not self._running:
+            return
+        
         self._running = False
-        if self._thread:
-            self._thread.join()
-            logger.info(f"Agent {self.name} stopped")
-    
-    def _run_loop(self) -> None:
-        """Main agent loop that processes tasks."""
-        while self._running:
-            for task in self.tasks:
-                try:
-                    task.execute()
-                except Exception as e:
-                    logger.error(f"Error in agent {self.name} executing task: {e}")
-            time.sleep(1)  # Basic rate limiting
+        for job in self._jobs:
+            job.remove()
+        self._jobs.clear()
+        
+        asyncio.run_coroutine_threadsafe(self._drain(), runtime.get_loop()).result()
+        logger.info(f"Agent {self.name} stopped")
+    
+    def _schedule(self, task: Any) -> None:
+        """Add a task's interval job to the shared scheduler."""
+        job = runtime.get_scheduler().add_job(
+            self._run_task,
+            "interval",
+            seconds=task.interval_seconds,
+            args=[task],
+            next_run_time=datetime.now(),
+            max_instances=1,  # Never overlap runs of the same task
+            coalesce=True,  # Collapse missed runs into a single one
+            misfire_grace_time=None
+        )
+        self._jobs.append(job)
+    
+    async def _run_task(self, task: Any) -> None:
+        """Execute a single scheduled task run on the shared event loop."""
+        run = asyncio.current_task()
+        self._active_runs.add(run)
+        try:
+            await task.execute_async()
+        except Exception as e:
+            logger.error(f"Error in agent {self.name} executing task: {e}")
+        finally:
+            self._active_runs.discard(run)
+    
+    async def _drain(self) -> None:
+        """Let in-flight task runs finish, then shut down the agent's tasks."""
+        if self._active_runs:
+            await asyncio.gather(*self._active_runs, return_exceptions=True)
+        
+        await asyncio.gather(
+            *(task.shutdown_async() for task in self.tasks),
+            return_exceptions=True
+        )
     
     def __repr__(self) -> str:
-        return f"Agent(name='{self.name}', id='{self.id}', tasks={len(self.tasks)})" 
+        return f"Agent(name='{self.name}', id='{self.id}', tasks={len(self.tasks)})" 
\ No newline at end of file
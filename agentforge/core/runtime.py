@@ -0,0 +1,77 @@
+from typing import Optional, Callable, Iterable, List, TypeVar
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock, Thread
+import asyncio
+import os
+
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+
+# Worker threads for blocking task code, sized for I/O-bound work
+_POOL = ThreadPoolExecutor(
+    max_workers=min(32, (os.cpu_count() or 4) * 4),
+    thread_name_prefix="agentforge"
+)
+
+# All agents schedule their tasks on one event loop in a single background
+# thread, started lazily; blocking task code runs on _POOL
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_scheduler: Optional[AsyncIOScheduler] = None
+_lock = Lock()
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def get_scheduler() -> AsyncIOScheduler:
+    """Get the shared task scheduler, starting the runtime on first use.
+    
+    Returns:
+        AsyncIOScheduler: The scheduler running on the shared event loop
+    """
+    global _loop, _scheduler
+    with _lock:
+        if _scheduler is None:
+            _loop = asyncio.new_event_loop()
+            _loop.set_default_executor(_POOL)
+            Thread(
+                target=_loop.run_forever,
+                name="agentforge-runtime",
+                daemon=True
+            ).start()
+            
+            _scheduler = AsyncIOScheduler(event_loop=_loop)
+            _scheduler.start()
+        return _scheduler
+
+
+def get_loop() -> asyncio.AbstractEventLoop:
+    """Get the shared event loop, starting the runtime on first use.
+    
+    Returns:
+        AbstractEventLoop: The event loop all agents run their tasks on
+    """
+    get_scheduler()
+    return _loop
+
+
+def fan_out(func: Callable[[T], R], items: Iterable[T]) -> List[R]:
+    """Call a blocking function for each item concurrently on the shared pool.
+    
+    Callers are often pool workers themselves, so work no worker has picked
+    up yet when the caller needs its result is run in the calling thread
+    instead of waited for. A saturated pool then degrades to serial calls
+    rather than deadlocking.
+    
+    Args:
+        func: The function to call
+        items: The argument of each call
+        
+    Returns:
+        List of results, in the order of items
+    """
+    items = list(items)
+    futures = [_POOL.submit(func, item) for item in items]
+    return [
+        func(item) if future.cancel() else future.result()
+        for future, item in zip(futures, items)
+    ]
@@ -1,12 +1,19 @@
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from decimal import Decimal
 import json
 
 from web3 import Web3
 from loguru import logger
+from pydantic import field_validator
 
 from .base import Task
-from ..utils.blockchain import BlockchainClient
+from ..core.runtime import fan_out
+from ..utils.blockchain import (
+    get_client,
+    to_checksum_address,
+    validate_address,
+    UNISWAP_V2_ROUTER_ABI
+)
 
 # Sushiswap Router for price comparison
 SUSHISWAP_ROUTER = "0xd9e1cE17f2641f24aE83637ab66a2cca9C378B9F"
@@ -21,22 +28,27 @@ class ArbitrageTask(Task):
     rpc_url: str = "https://eth.llamarpc.com"
     chain_id: int = 1
     
+    @field_validator("token_address")
+    @classmethod
+    def _validate_token_address(cls, value: str) -> str:
+        return validate_address(value)
+    
     def __init__(self, **data):
         super().__init__(**data)
-        self.blockchain = BlockchainClient(self.rpc_url, self.chain_id)
+        self.blockchain = get_client(self.rpc_url, self.chain_id)
+        self._checksum_token = to_checksum_address(self.token_address)
         
         # Initialize Sushiswap router contract
         self.sushiswap_router = self.blockchain.get_contract(
             SUSHISWAP_ROUTER,
-            self.blockchain.UNISWAP_V2_ROUTER_ABI  # Same ABI as Uniswap V2
+            UNISWAP_V2_ROUTER_ABI  # Same ABI as Uniswap V2
         )
     
     def execute(self) -> None:
         """Check for arbitrage opportunities between Uniswap and Sushiswap."""
         try:
             # Get prices from both DEXes
-            uni_price = self._get_uniswap_price()
-            sushi_price = self._get_sushiswap_price()
+            uni_price, sushi_price = self._get_prices()
             
             # Calculate price difference percentage
             price_diff = abs(uni_price - sushi_price)
@@ -65,39 +77,17 @@ class ArbitrageTask(Task):
         except Exception as e:
             logger.error(f"Error checking arbitrage for {self.token_address}: {e}")
     
-    def _get_uniswap_price(self) -> Decimal:
-        """Get token price from Uniswap."""
-        return self.blockchain.get_token_price_usd(self.token_address)
-    
-    def _get_sushiswap_price(self) -> Decimal:
-        """Get token price from Sushiswap using the same method as Uniswap."""
-        token_address = self.blockchain.w3.to_checksum_address(self.token_address)
-        
-        # Use WETH as intermediate if token is not WETH
-        if token_address.lower() != self.blockchain.WETH.lower():
-            path = [token_address, self.blockchain.WETH, self.blockchain.USDC]
-        else:
-            path = [self.blockchain.WETH, self.blockchain.USDC]
+    def _get_prices(self) -> Tuple[Decimal, Decimal]:
+        """Get token prices from Uniswap and Sushiswap concurrently.
         
-        try:
-            # Get decimals for the input token
-            token_contract = self.blockchain.get_contract(token_address, self.blockchain.ERC20_ABI)
-            decimals = token_contract.functions.decimals().call()
-            
-            # Calculate price through Sushiswap
-            amount_in = 10 ** decimals
-            amounts = self.sushiswap_router.functions.getAmountsOut(
-                amount_in,
-                path
-            ).call()
-            
-            # Convert to USD price
-            price = Decimal(amounts[-1]) / Decimal(10 ** 6)
-            if len(path) == 3:
-                price = price / (Decimal(amounts[1]) / Decimal(10 ** 18))
-                
-            return price
-            
-        except Exception as e:
-            logger.error(f"Error getting Sushiswap price for {token_address}: {e}")
-            raise 
\ No newline at end of file
+        Both quotes bypass the price cache so neither side is a stale cached price.
+        """
+        uni_price, sushi_price = fan_out(
+            lambda router: self.blockchain.get_token_price_usd(
+                self._checksum_token,
+                router,
+                use_cache=False
+            ),
+            [self.blockchain.uniswap_router, self.sushiswap_router]
+        )
+        return uni_price, sushi_price 
\ No newline at end of file
@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
+import asyncio
 from typing import Any, Dict, Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 
 class Task(ABC, BaseModel):
@@ -10,9 +11,13 @@ class Task(ABC, BaseModel):
     Tasks should implement the execute() method with their specific logic.
     """
     
+    # Tasks keep runtime state (clients, caches, last values) as attributes
+    model_config = ConfigDict(extra="allow", arbitrary_types_allowed=True)
+    
     name: str
     description: Optional[str] = None
     config: Dict[str, Any] = {}
+    interval_seconds: int = 60  # How often the agent runs this task
     
     @abstractmethod
     def execute(self) -> Any:
@@ -24,5 +29,22 @@ class Task(ABC, BaseModel):
         """
         pass
     
+    async def execute_async(self) -> Any:
+        """Execute the task from an event loop.
+        
+        Tasks with native async I/O override this. By default the blocking
+        execute() runs in a worker thread so it does not stall the loop.
+        Returns:
+            Any: The result of the task execution
+        """
+        return await asyncio.to_thread(self.execute)
+    
+    async def shutdown_async(self) -> None:
+        """Release anything the task keeps running between executions.
+        
+        Called by the agent when it stops, after in-flight runs have finished.
+        """
+        pass
+    
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}(name='{self.name}')" 
\ No newline at end of file
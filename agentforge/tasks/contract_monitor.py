@@ -1,19 +1,45 @@
-from typing import List, Dict, Any, Optional, Set
+from typing import List, Dict, Any, Optional, Iterator, Tuple, Callable
 from decimal import Decimal
+from collections import OrderedDict
+import asyncio
+import hashlib
+import os
+import shelve
 
-from web3 import Web3
+from web3 import Web3, AsyncWeb3, WebsocketProviderV2
 from web3.contract import Contract
 from eth_typing import Address
 from loguru import logger
+from pydantic import field_validator
 
 from .base import Task
-from ..utils.blockchain import BlockchainClient
+from ..core.runtime import fan_out
+from ..utils.blockchain import get_client, to_checksum_address, validate_address
 
 # Common event signatures to monitor
 TRANSFER_EVENT = "Transfer(address,address,uint256)"
 APPROVAL_EVENT = "Approval(address,address,uint256)"
 SWAP_EVENT = "Swap(address,uint256,uint256,uint256,uint256,address)"
 
+# Supported events and their topic0 hashes, computed once per process
+_KNOWN_EVENTS = frozenset({TRANSFER_EVENT, APPROVAL_EVENT, SWAP_EVENT})
+_TOPIC0 = {
+    signature: Web3.keccak(text=signature).hex()
+    for signature in _KNOWN_EVENTS
+}
+
+# How many recently processed transaction hashes to remember
+MAX_PROCESSED_TXS = 1000
+
+# Prefix of the local files holding each monitor's block cursor
+STATE_FILE_PREFIX = ".agentforge_state"
+
+# Upper bound for the adaptive get_logs block window
+MAX_LOG_WINDOW_BLOCKS = 2048
+
+# Fragments of RPC errors meaning a get_logs range returned too much data
+_TOO_MANY_RESULTS_ERRORS = ("more than", "too many", "response size")
+
 class ContractMonitorTask(Task):
     """Task for monitoring smart contract events and state changes."""
     
@@ -23,35 +49,57 @@ class ContractMonitorTask(Task):
     rpc_url: str = "https://eth.llamarpc.com"
     chain_id: int = 1
     blocks_to_scan: int = 100  # How many recent blocks to scan
+    ws_rpc_url: Optional[str] = None  # Subscribe to logs instead of polling if set
+    state_dir: str = "."  # Directory holding the block cursor file
+    interval_seconds: int = 12  # Roughly one Ethereum block
+    
+    @field_validator("contract_address")
+    @classmethod
+    def _validate_contract_address(cls, value: str) -> str:
+        return validate_address(value)
     
     def __init__(self, **data):
         super().__init__(**data)
-        self.blockchain = BlockchainClient(self.rpc_url, self.chain_id)
+        self.blockchain = get_client(self.rpc_url, self.chain_id)
+        self._address_checksum = to_checksum_address(self.contract_address)
+        
+        # Block cursor file, opened on first run to resume after a restart
+        self._state: Optional[shelve.Shelf] = None
         self.last_processed_block = 0
-        self.processed_txs: Set[str] = set()
+        self.processed_txs: "OrderedDict[str, None]" = OrderedDict()
         
         # Get contract ABI - for this example, we'll use ERC20 events
-        self.monitored_events = {
-            TRANSFER_EVENT,
-            APPROVAL_EVENT,
-            SWAP_EVENT
-        }.intersection(set(self.events_to_monitor))
+        self.monitored_events = _KNOWN_EVENTS.intersection(self.events_to_monitor)
+        
+        # topic0 of each monitored event, so the node only returns matching logs
+        self._topic0 = [_TOPIC0[signature] for signature in self.monitored_events]
+        
+        # get_logs block window, adapted to how busy the contract is
+        self._current_step = min(max(self.blocks_to_scan, 1), MAX_LOG_WINDOW_BLOCKS)
+        
+        # Background log subscription, started on first run when ws_rpc_url is set
+        self._subscription: Optional[asyncio.Task] = None
+        
+        # Blocking call the subscription is running in a worker thread, which
+        # keeps running when the subscription is cancelled
+        self._subscription_worker: Optional[asyncio.Future] = None
     
     def execute(self) -> None:
         """Monitor contract events and state changes."""
         try:
+            self._open_state()
+            
             # Get current block
             current_block = self.blockchain.w3.eth.block_number
             
-            # If this is the first run, start from current block
-            if self.last_processed_block == 0:
-                self.last_processed_block = current_block - 1
-            
             # Calculate block range to scan
-            start_block = max(
-                self.last_processed_block + 1,
-                current_block - self.blocks_to_scan
-            )
+            if self.last_processed_block == 0:
+                # First run with no saved cursor: only look back blocks_to_scan
+                start_block = max(current_block - self.blocks_to_scan, 0)
+            else:
+                # Resume right after the cursor however far behind it is, so
+                # downtime doesn't drop events; _get_logs splits wide ranges
+                start_block = self.last_processed_block + 1
             
             if start_block >= current_block:
                 return  # No new blocks to process
@@ -62,50 +110,197 @@ class ContractMonitorTask(Task):
             )
             
             # Get contract events
-            self._process_events(start_block, current_block)
+            last_block = self._process_events(start_block, current_block)
             
-            # Update last processed block
-            self.last_processed_block = current_block
+            # Only advance past blocks whose events were all handled, so a
+            # failed window is scanned again on the next run
+            if last_block >= start_block:
+                self._save_last_processed_block(last_block)
             
         except Exception as e:
             logger.error(f"Error monitoring contract {self.contract_address}: {e}")
     
-    def _process_events(self, start_block: int, end_block: int) -> None:
-        """Process contract events in the given block range."""
-        # Get event logs
-        try:
-            # Create event filter
-            event_filter = self.blockchain.w3.eth.filter({
-                'fromBlock': start_block,
-                'toBlock': end_block,
-                'address': Web3.to_checksum_address(self.contract_address)
+    async def execute_async(self) -> None:
+        """Monitor contract events, over a log subscription if ws_rpc_url is set.
+        
+        Without ws_rpc_url this polls like execute(). Otherwise each run only
+        makes sure the subscription is alive, restarting it if it has failed.
+        """
+        if not self.ws_rpc_url or not self._topic0:
+            return await super().execute_async()
+        
+        if self._subscription is not None and not self._subscription.done():
+            return
+        
+        if self._subscription is not None and not self._subscription.cancelled():
+            error = self._subscription.exception()
+            if error is not None:
+                logger.error(
+                    f"Log subscription for {self.contract_address} failed, "
+                    f"reconnecting: {error}"
+                )
+        
+        self._subscription = asyncio.create_task(self._subscribe_logs())
+    
+    async def shutdown_async(self) -> None:
+        """Close the log subscription, if one is running, and the cursor file."""
+        if self._subscription is not None and not self._subscription.done():
+            self._subscription.cancel()
+            await asyncio.gather(self._subscription, return_exceptions=True)
+        
+        # Let a scan or cursor write still running in a worker thread finish
+        # before the cursor file is closed under it
+        if self._subscription_worker is not None:
+            await asyncio.gather(self._subscription_worker, return_exceptions=True)
+            self._subscription_worker = None
+        
+        if self._state is not None:
+            state, self._state = self._state, None
+            await asyncio.to_thread(state.close)
+    
+    async def _subscribe_logs(self) -> None:
+        """Handle monitored events as the node pushes them over a websocket."""
+        async with AsyncWeb3.persistent_websocket(
+            WebsocketProviderV2(self.ws_rpc_url)
+        ) as w3:
+            await w3.eth.subscribe("logs", {
+                "address": self._address_checksum,
+                "topics": [self._topic0]
             })
+            logger.info(f"Subscribed to events for contract {self.contract_address}")
             
-            # Get all matching events
-            events = event_filter.get_all_entries()
+            # Catch up on blocks missed before the subscription started;
+            # anything also delivered by the subscription is deduplicated
+            await self._run_blocking(self.execute)
             
-            for event in events:
-                tx_hash = event['transactionHash'].hex()
-                
-                # Skip if we've already processed this transaction
-                if tx_hash in self.processed_txs:
-                    continue
-                
-                # Get transaction receipt for more details
-                receipt = self.blockchain.w3.eth.get_transaction_receipt(tx_hash)
-                
-                # Process the event
-                self._handle_event(event, receipt)
-                
-                # Mark transaction as processed
-                self.processed_txs.add(tx_hash)
-                
-                # Keep processed tx set from growing too large
-                if len(self.processed_txs) > 1000:
-                    self.processed_txs = set(list(self.processed_txs)[-1000:])
+            async for response in w3.ws.process_subscriptions():
+                event = response["result"]
+                await self._run_blocking(self._handle_events, [event])
                 
+                # Later events from this block may still arrive, so only the
+                # block before it is known to be complete
+                if event["blockNumber"] - 1 > self.last_processed_block:
+                    await self._run_blocking(
+                        self._save_last_processed_block,
+                        event["blockNumber"] - 1
+                    )
+    
+    async def _run_blocking(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Run a blocking call for the subscription in a worker thread.
+        
+        The call is shielded and tracked, so cancelling the subscription
+        leaves it to finish and shutdown_async can wait for it.
+        """
+        self._subscription_worker = asyncio.ensure_future(asyncio.to_thread(func, *args))
+        return await asyncio.shield(self._subscription_worker)
+    
+    def _process_events(self, start_block: int, end_block: int) -> int:
+        """Process contract events in the given block range.
+        
+        Returns:
+            int: The last block whose events were all handled, or
+            start_block - 1 if the first window failed
+        """
+        if not self._topic0:
+            return end_block  # None of the requested events are supported
+        
+        last_block = start_block - 1
+        try:
+            for window_end, events in self._get_logs(start_block, end_block):
+                self._handle_events(events)
+                last_block = window_end
+            
         except Exception as e:
             logger.error(f"Error processing events: {e}")
+        
+        return last_block
+    
+    def _handle_events(self, events: List[Dict[str, Any]]) -> None:
+        """Handle the first event of each transaction not yet processed."""
+        # Only the first event of each unseen transaction is handled
+        pending: Dict[str, Dict[str, Any]] = {}
+        for event in events:
+            tx_hash = event['transactionHash'].hex()
+            if tx_hash not in self.processed_txs and tx_hash not in pending:
+                pending[tx_hash] = event
+        
+        # Fetch transaction receipts concurrently rather than one at a time
+        receipts = fan_out(self.blockchain.w3.eth.get_transaction_receipt, pending)
+        
+        for (tx_hash, event), receipt in zip(pending.items(), receipts):
+            # Process the event
+            self._handle_event(event, receipt)
+            
+            # Mark transaction as processed
+            self.processed_txs[tx_hash] = None
+            
+            # Keep processed txs from growing too large, evicting the oldest
+            if len(self.processed_txs) > MAX_PROCESSED_TXS:
+                self.processed_txs.popitem(last=False)
+    
+    def _open_state(self) -> shelve.Shelf:
+        """Open the block cursor file, resuming from the block saved in it.
+        
+        The file is keyed by chain, contract and monitored topics, so
+        monitors watching different events of one contract keep separate
+        cursors.
+        """
+        if self._state is None:
+            topics = hashlib.sha1(",".join(sorted(self._topic0)).encode()).hexdigest()
+            os.makedirs(self.state_dir, exist_ok=True)
+            self._state = shelve.open(os.path.join(
+                self.state_dir,
+                f"{STATE_FILE_PREFIX}_{self.chain_id}_{self._address_checksum}_{topics[:8]}"
+            ))
+            self.last_processed_block = self._state.get("last_block", 0)
+        return self._state
+    
+    def _save_last_processed_block(self, block_number: int) -> None:
+        """Record the last fully processed block, persisting it for restarts."""
+        state = self._open_state()
+        self.last_processed_block = block_number
+        state["last_block"] = block_number
+        state.sync()
+    
+    def _get_logs(
+        self,
+        start_block: int,
+        end_block: int
+    ) -> Iterator[Tuple[int, List[Dict[str, Any]]]]:
+        """Fetch monitored event logs, adapting the block window per request.
+        
+        The window doubles after each successful request, up to
+        MAX_LOG_WINDOW_BLOCKS, and halves when the node rejects a range for
+        returning too many results. The window carries over between runs.
+        
+        Yields:
+            Tuple of the last block of each window and the logs found in it
+        """
+        while start_block <= end_block:
+            window_end = min(start_block + self._current_step - 1, end_block)
+            try:
+                logs = self._fetch_logs(start_block, window_end)
+            except ValueError as e:
+                message = str(e).lower()
+                if (
+                    self._current_step > 1
+                    and any(err in message for err in _TOO_MANY_RESULTS_ERRORS)
+                ):
+                    self._current_step = max(self._current_step // 2, 1)
+                    continue
+                raise
+            self._current_step = min(self._current_step * 2, MAX_LOG_WINDOW_BLOCKS)
+            yield window_end, logs
+            start_block = window_end + 1
+    
+    def _fetch_logs(self, start_block: int, end_block: int) -> List[Dict[str, Any]]:
+        """Fetch monitored event logs for a block range in a single call."""
+        return self.blockchain.w3.eth.get_logs({
+            'fromBlock': start_block,
+            'toBlock': end_block,
+            'address': self._address_checksum,
+            'topics': [self._topic0]
+        })
     
     def _handle_event(self, event: Dict[str, Any], receipt: Dict[str, Any]) -> None:
         """Handle a specific contract event."""
@@ -1,11 +1,13 @@
 from typing import Optional, Literal
 from decimal import Decimal
+import asyncio
 
 from web3 import Web3
 from loguru import logger
+from pydantic import field_validator
 
 from .base import Task
-from ..utils.blockchain import BlockchainClient
+from ..utils.blockchain import get_client, to_checksum_address, validate_address
 
 
 class PriceTrackingTask(Task):
@@ -18,15 +20,25 @@ class PriceTrackingTask(Task):
     chain_id: int = 1  # Default to Ethereum mainnet
     rpc_url: str = "https://eth.llamarpc.com"  # Default RPC URL
     
+    @field_validator("token_address")
+    @classmethod
+    def _validate_token_address(cls, value: str) -> str:
+        return validate_address(value)
+    
     def __init__(self, **data):
         super().__init__(**data)
-        self.blockchain = BlockchainClient(self.rpc_url, self.chain_id)
+        self.blockchain = get_client(self.rpc_url, self.chain_id)
+        self._checksum_token = to_checksum_address(self.token_address)
         self.last_price: Optional[Decimal] = None
     
     def execute(self) -> None:
+        """Run execute_async() to completion for synchronous callers."""
+        asyncio.run(self.execute_async())
+    
+    async def execute_async(self) -> None:
         """Check the current price against the threshold and generate alerts."""
         try:
-            current_price = self._get_token_price()
+            current_price = await self._get_token_price()
             
             # Log price change if significant
             if self.last_price is not None:
@@ -55,6 +67,6 @@ class PriceTrackingTask(Task):
         except Exception as e:
             logger.error(f"Error tracking price for {self.token_address}: {e}")
     
-    def _get_token_price(self) -> Decimal:
+    async def _get_token_price(self) -> Decimal:
         """Get the current price of the token using blockchain data."""
-        return self.blockchain.get_token_price_usd(self.token_address) 
\ No newline at end of file
+        return await self.blockchain.get_token_price_usd_async(self._checksum_token) 
\ No newline at end of file
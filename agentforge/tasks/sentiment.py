@@ -1,5 +1,6 @@
 from typing import Optional, Dict, Any
 from decimal import Decimal
+import asyncio
 
 from loguru import logger
 
@@ -15,6 +16,7 @@ class SentimentAnalysisTask(Task):
     timeframe_hours: int = 24  # How many hours of data to analyze
     sentiment_threshold: float = 0.5  # Threshold for sentiment alerts
     twitter_bearer_token: Optional[str] = None
+    interval_seconds: int = 3600  # Sentiment moves slowly; poll hourly
     
     def __init__(self, **data):
         super().__init__(**data)
@@ -22,10 +24,25 @@ class SentimentAnalysisTask(Task):
         self.last_sentiment: Optional[float] = None
     
     def execute(self) -> None:
+        """Run execute_async() to completion for synchronous callers."""
+        async def run() -> None:
+            try:
+                await self.execute_async()
+            finally:
+                # The session is bound to this run's event loop
+                await self.twitter.close_async()
+        
+        asyncio.run(run())
+    
+    async def shutdown_async(self) -> None:
+        """Close the Twitter client's aiohttp session."""
+        await self.twitter.close_async()
+    
+    async def execute_async(self) -> None:
         """Analyze current sentiment and generate alerts on significant changes."""
         try:
             # Get current sentiment metrics
-            metrics = self.twitter.get_crypto_sentiment(
+            metrics = await self.twitter.get_crypto_sentiment_async(
                 symbol=self.token_symbol,
                 timeframe_hours=self.timeframe_hours
             )
@@ -1,12 +1,33 @@
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple, Callable, Awaitable, Iterator, TypeVar
 from decimal import Decimal
+from concurrent.futures import Future
+from contextlib import contextmanager
+from functools import lru_cache
+from threading import Lock
+import asyncio
 import json
+import os
 
-from web3 import Web3
-from web3.middleware import geth_poa_middleware
+import orjson
+import requests
+from cachetools import TTLCache
+from requests.adapters import HTTPAdapter
+from web3 import Web3, AsyncWeb3, HTTPProvider, AsyncHTTPProvider
+from web3.middleware import geth_poa_middleware, async_geth_poa_middleware
+from web3.contract import Contract
+from web3.types import RPCResponse
 from eth_typing import Address
 from loguru import logger
 
+from ..core.runtime import fan_out
+
+try:
+    import redis
+except ImportError:  # Redis is optional; prices are then cached in-process
+    redis = None
+
+T = TypeVar("T")
+
 # Standard Uniswap V2 Router ABI for price queries
 UNISWAP_V2_ROUTER_ABI = [
     {
@@ -32,6 +53,44 @@ ERC20_ABI = [
     }
 ]
 
+
+def validate_address(address: str) -> str:
+    """Check that a string is a valid Ethereum address.
+    
+    Args:
+        address: The address to check
+        
+    Returns:
+        str: The address, unchanged
+        
+    Raises:
+        ValueError: If the address is not a valid Ethereum address
+    """
+    if not Web3.is_address(address):
+        raise ValueError(f"Invalid Ethereum address: {address!r}")
+    return address
+
+
+@lru_cache(maxsize=4096)
+def to_checksum_address(address: str) -> str:
+    """Checksum an address, memoizing the keccak256 hash it requires."""
+    return Web3.to_checksum_address(address)
+
+
+class OrjsonHTTPProvider(HTTPProvider):
+    """HTTPProvider decoding JSON-RPC responses with orjson."""
+    
+    def decode_rpc_response(self, raw_response: bytes) -> RPCResponse:
+        return orjson.loads(raw_response)
+
+
+class OrjsonAsyncHTTPProvider(AsyncHTTPProvider):
+    """AsyncHTTPProvider decoding JSON-RPC responses with orjson."""
+    
+    def decode_rpc_response(self, raw_response: bytes) -> RPCResponse:
+        return orjson.loads(raw_response)
+
+
 class BlockchainClient:
     """Utility class for blockchain interactions."""
     
@@ -42,77 +101,412 @@ class BlockchainClient:
     # DEX router addresses
     UNISWAP_V2_ROUTER = "0x7a250d5630B4cF539739dF2C5dAcb4c659F2488D"
     
-    def __init__(self, rpc_url: str, chain_id: int = 1):
+    # Base units per whole token (USDC has 6 decimals, WETH has 18)
+    USDC_UNIT = 10 ** 6
+    WETH_UNIT = 10 ** 18
+    
+    # USDC_UNIT as a Decimal, built once instead of on every quote
+    USDC_UNIT_DECIMAL = Decimal(USDC_UNIT)
+    
+    # How long a quoted price may be reused, in seconds
+    PRICE_CACHE_TTL = 30
+    
+    def __init__(
+        self,
+        rpc_url: str,
+        chain_id: int = 1,
+        redis_url: Optional[str] = None
+    ):
         """Initialize the blockchain client.
         
         Args:
             rpc_url: The RPC endpoint URL
             chain_id: The chain ID (default: 1 for Ethereum mainnet)
+            redis_url: Redis URL for the shared price cache. If None, will try
+                to get from env and otherwise fall back to an in-process cache.
         """
-        self.w3 = Web3(Web3.HTTPProvider(rpc_url))
+        # Pooled keep-alive session shared by every task using this client
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        
+        self.w3 = Web3(OrjsonHTTPProvider(rpc_url, session=session))
         self.w3.middleware_onion.inject(geth_poa_middleware, layer=0)
         self.chain_id = chain_id
         
+        # Async counterpart for tasks running on an event loop
+        self.async_w3 = AsyncWeb3(OrjsonAsyncHTTPProvider(rpc_url))
+        self.async_w3.middleware_onion.inject(async_geth_poa_middleware, layer=0)
+        
+        # ERC20 decimals never change, and contract objects are reusable
+        self._decimals: Dict[str, int] = {}
+        self._contracts: Dict[Tuple[str, int], Contract] = {}
+        self._async_contracts: Dict[Tuple[str, int], Any] = {}
+        
         # Initialize common contracts
         self.uniswap_router = self.w3.eth.contract(
-            address=self.w3.to_checksum_address(self.UNISWAP_V2_ROUTER),
+            address=to_checksum_address(self.UNISWAP_V2_ROUTER),
             abi=UNISWAP_V2_ROUTER_ABI
         )
+        
+        # Short-lived price cache, shared across processes when Redis is configured
+        redis_url = redis_url or os.getenv("REDIS_URL")
+        if redis_url:
+            if redis is None:
+                raise ImportError(
+                    "Redis URL provided but redis is not installed. "
+                    "Install it with `pip install agentforge[redis]`."
+                )
+            self._redis = redis.Redis.from_url(redis_url)
+        else:
+            self._redis = None
+        self._price_cache = TTLCache(maxsize=1024, ttl=self.PRICE_CACHE_TTL)
+        self._price_cache_lock = Lock()
+        
+        # Price lookups currently hitting the chain, so callers asking for the
+        # same price at the same time share a single RPC round-trip
+        self._inflight: Dict[str, Future] = {}
+        self._inflight_lock = Lock()
     
-    def get_token_price_usd(self, token_address: str) -> Decimal:
-        """Get the USD price of a token using Uniswap V2.
+    def get_token_price_usd(
+        self,
+        token_address: str,
+        router: Optional[Contract] = None,
+        use_cache: bool = True
+    ) -> Decimal:
+        """Get the USD price of a token using a Uniswap V2 style router.
         
         Args:
             token_address: The token contract address
+            router: Router contract to quote against (default: Uniswap V2)
+            use_cache: Whether a cached price may be returned; pass False when
+                the price is compared against a fresh quote
             
         Returns:
             Decimal: The token price in USD
         """
-        token_address = self.w3.to_checksum_address(token_address)
+        token_address = to_checksum_address(token_address)
+        router = router or self.uniswap_router
+        
+        cache_key = self._price_cache_key(token_address, router)
+        if use_cache:
+            cached_price = self._get_cached_price(cache_key)
+            if cached_price is not None:
+                return cached_price
+        
+        return self._coalesced(
+            cache_key,
+            lambda: self._quote_price(token_address, router, cache_key)
+        )
+    
+    async def get_token_price_usd_async(
+        self,
+        token_address: str,
+        router: Optional[Contract] = None,
+        use_cache: bool = True
+    ) -> Decimal:
+        """Get the USD price of a token without blocking the event loop.
         
+        Async counterpart of get_token_price_usd, sharing its caches.
+        
+        Args:
+            token_address: The token contract address
+            router: Router contract to quote against (default: Uniswap V2)
+            use_cache: Whether a cached price may be returned; pass False when
+                the price is compared against a fresh quote
+            
+        Returns:
+            Decimal: The token price in USD
+        """
+        token_address = to_checksum_address(token_address)
+        router = router or self.uniswap_router
+        
+        cache_key = self._price_cache_key(token_address, router)
+        if use_cache:
+            cached_price = await self._get_cached_price_async(cache_key)
+            if cached_price is not None:
+                return cached_price
+        
+        return await self._coalesced_async(
+            cache_key,
+            lambda: self._quote_price_async(token_address, router, cache_key)
+        )
+    
+    def get_token_price_usd_batch(
+        self,
+        token_addresses: List[str],
+        router: Optional[Contract] = None
+    ) -> Dict[str, Decimal]:
+        """Get USD prices for several tokens with their RPC calls in flight together.
+        
+        Args:
+            token_addresses: The token contract addresses
+            router: Router contract to quote against (default: Uniswap V2)
+            
+        Returns:
+            Dict mapping each token address to its price in USD
+        """
+        prices = fan_out(
+            lambda address: self.get_token_price_usd(address, router),
+            token_addresses
+        )
+        return dict(zip(token_addresses, prices))
+    
+    def get_contract(self, address: str, abi: list) -> Any:
+        """Get a contract instance.
+        
+        Instances are cached per address and ABI object.
+        
+        Args:
+            address: The contract address
+            abi: The contract ABI
+            
+        Returns:
+            Contract: A Web3.py contract instance
+        """
+        address = to_checksum_address(address)
+        key = (address, id(abi))
+        contract = self._contracts.get(key)
+        if contract is None:
+            contract = self.w3.eth.contract(address=address, abi=abi)
+            self._contracts[key] = contract
+        return contract
+    
+    def _price_cache_key(self, token_address: str, router: Contract) -> str:
+        """Build the price cache key for a token quoted on a router."""
+        return f"price:{self.chain_id}:{router.address}:{token_address}"
+    
+    def _price_path(self, token_address: str) -> List[str]:
+        """Build the swap path used to quote a checksummed token in USDC."""
         # Use WETH as intermediate if token is not WETH
-        if token_address.lower() != self.WETH.lower():
-            path = [token_address, self.WETH, self.USDC]
-        else:
-            path = [self.WETH, self.USDC]
+        if token_address != self.WETH:
+            return [token_address, self.WETH, self.USDC]
+        return [self.WETH, self.USDC]
+    
+    def _price_from_amounts(self, amounts: List[int]) -> Decimal:
+        """Convert getAmountsOut output for one input token into a USD price."""
+        # Convert to USD price, staying in integers until the final division
+        if len(amounts) == 3:  # If going through WETH
+            # (usdc_out / 10**6) / (weth_out / 10**18)
+            return (
+                Decimal(amounts[-1] * self.WETH_UNIT)
+                / Decimal(amounts[1] * self.USDC_UNIT)
+            )
+        return Decimal(amounts[-1]) / self.USDC_UNIT_DECIMAL
+    
+    def _quote_price(self, token_address: str, router: Contract, cache_key: str) -> Decimal:
+        """Quote a token's USD price through a router and cache it."""
+        path = self._price_path(token_address)
         
         try:
             # Get decimals for the input token
-            token_contract = self.w3.eth.contract(
-                address=token_address,
-                abi=ERC20_ABI
-            )
-            decimals = token_contract.functions.decimals().call()
+            decimals = self._token_decimals(token_address)
             
-            # Calculate price through Uniswap
+            # Calculate price through the router
             amount_in = 10 ** decimals  # Use 1 token as input
-            amounts = self.uniswap_router.functions.getAmountsOut(
+            amounts = router.functions.getAmountsOut(
                 amount_in,
                 path
             ).call()
             
-            # Convert to USD price (USDC has 6 decimals)
-            price = Decimal(amounts[-1]) / Decimal(10 ** 6)
-            if len(path) == 3:  # If going through WETH
-                price = price / (Decimal(amounts[1]) / Decimal(10 ** 18))
-                
+            price = self._price_from_amounts(amounts)
+            self._set_cached_price(cache_key, price)
             return price
             
         except Exception as e:
             logger.error(f"Error getting price for {token_address}: {e}")
             raise
     
-    def get_contract(self, address: str, abi: list) -> Any:
-        """Get a contract instance.
+    async def _quote_price_async(
+        self,
+        token_address: str,
+        router: Contract,
+        cache_key: str
+    ) -> Decimal:
+        """Async counterpart of _quote_price."""
+        path = self._price_path(token_address)
+        
+        try:
+            # Get decimals for the input token
+            decimals = await self._token_decimals_async(token_address)
+            
+            # Calculate price through the router
+            async_router = self._get_async_contract(router.address, router.abi)
+            amount_in = 10 ** decimals  # Use 1 token as input
+            amounts = await async_router.functions.getAmountsOut(
+                amount_in,
+                path
+            ).call()
+            
+            price = self._price_from_amounts(amounts)
+            await self._set_cached_price_async(cache_key, price)
+            return price
+            
+        except Exception as e:
+            logger.error(f"Error getting price for {token_address}: {e}")
+            raise
+    
+    def _coalesced(self, key: str, fetch: Callable[[], T]) -> T:
+        """Run a lookup once for every concurrent caller sharing a key.
         
         Args:
-            address: The contract address
-            abi: The contract ABI
+            key: Identifies the lookup
+            fetch: Performs the lookup; only called by the first caller
             
         Returns:
-            Contract: A Web3.py contract instance
+            The lookup's result, shared by all callers
         """
-        return self.w3.eth.contract(
-            address=self.w3.to_checksum_address(address),
-            abi=abi
-        ) 
\ No newline at end of file
+        future, is_leader = self._claim_inflight(key)
+        if not is_leader:
+            return future.result()
+        
+        with self._leading(key, future):
+            result = fetch()
+            future.set_result(result)
+            return result
+    
+    async def _coalesced_async(self, key: str, fetch: Callable[[], Awaitable[T]]) -> T:
+        """Async counterpart of _coalesced, sharing its in-flight lookups."""
+        future, is_leader = self._claim_inflight(key)
+        if not is_leader:
+            # Shielded so a cancelled waiter doesn't cancel the shared lookup
+            return await asyncio.shield(asyncio.wrap_future(future))
+        
+        with self._leading(key, future):
+            result = await fetch()
+            future.set_result(result)
+            return result
+    
+    @contextmanager
+    def _leading(self, key: str, future: Future) -> Iterator[None]:
+        """Pass the leader's failure to waiters and release the lookup."""
+        try:
+            yield
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            self._release_inflight(key, future)
+    
+    def _claim_inflight(self, key: str) -> Tuple[Future, bool]:
+        """Join an in-flight lookup for a key, or start one.
+        
+        Returns:
+            Tuple of the lookup's future and whether the caller must perform
+            the lookup and resolve the future itself
+        """
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                return future, False
+            future = Future()
+            self._inflight[key] = future
+            return future, True
+    
+    def _release_inflight(self, key: str, future: Future) -> None:
+        """Forget a finished in-flight lookup."""
+        with self._inflight_lock:
+            self._inflight.pop(key, None)
+        
+        # The leader was interrupted (e.g. cancelled); don't leave waiters hanging
+        if not future.done():
+            future.cancel()
+    
+    def _get_cached_price(self, key: str) -> Optional[Decimal]:
+        """Look up a cached price, returning None on a miss."""
+        if self._redis is not None:
+            try:
+                value = self._redis.get(key)
+                return Decimal(value.decode()) if value is not None else None
+            except redis.RedisError as e:
+                logger.warning(f"Price cache lookup failed for {key}: {e}")
+                return None
+        
+        with self._price_cache_lock:
+            return self._price_cache.get(key)
+    
+    def _set_cached_price(self, key: str, price: Decimal) -> None:
+        """Store a price in the cache for PRICE_CACHE_TTL seconds."""
+        if self._redis is not None:
+            try:
+                self._redis.setex(key, self.PRICE_CACHE_TTL, str(price))
+            except redis.RedisError as e:
+                logger.warning(f"Price cache update failed for {key}: {e}")
+            return
+        
+        with self._price_cache_lock:
+            self._price_cache[key] = price
+    
+    async def _get_cached_price_async(self, key: str) -> Optional[Decimal]:
+        """Async counterpart of _get_cached_price."""
+        if self._redis is not None:
+            # Redis calls block; keep them off the event loop
+            return await asyncio.to_thread(self._get_cached_price, key)
+        return self._get_cached_price(key)
+    
+    async def _set_cached_price_async(self, key: str, price: Decimal) -> None:
+        """Async counterpart of _set_cached_price."""
+        if self._redis is not None:
+            await asyncio.to_thread(self._set_cached_price, key, price)
+        else:
+            self._set_cached_price(key, price)
+    
+    def _get_async_contract(self, address: str, abi: list) -> Any:
+        """Get a cached contract instance bound to the async Web3 client."""
+        address = to_checksum_address(address)
+        key = (address, id(abi))
+        contract = self._async_contracts.get(key)
+        if contract is None:
+            contract = self.async_w3.eth.contract(address=address, abi=abi)
+            self._async_contracts[key] = contract
+        return contract
+    
+    def _token_decimals(self, address: str) -> int:
+        """Get the ERC20 decimals of a token, querying the chain only once."""
+        decimals = self._decimals.get(address)
+        if decimals is None:
+            token_contract = self.get_contract(address, ERC20_ABI)
+            decimals = token_contract.functions.decimals().call()
+            self._decimals[address] = decimals
+        return decimals
+    
+    async def _token_decimals_async(self, address: str) -> int:
+        """Async counterpart of _token_decimals, sharing the same cache."""
+        decimals = self._decimals.get(address)
+        if decimals is None:
+            token_contract = self._get_async_contract(address, ERC20_ABI)
+            decimals = await token_contract.functions.decimals().call()
+            self._decimals[address] = decimals
+        return decimals 
+
+
+_CLIENTS: Dict[Tuple[str, int], BlockchainClient] = {}
+_CLIENTS_LOCK = Lock()
+
+
+def get_client(
+    rpc_url: str,
+    chain_id: int = 1,
+    redis_url: Optional[str] = None
+) -> BlockchainClient:
+    """Get the shared blockchain client for an RPC endpoint and chain.
+    
+    Tasks on the same chain share one client, and with it one connection pool
+    and one set of cached contracts.
+    
+    Args:
+        rpc_url: The RPC endpoint URL
+        chain_id: The chain ID (default: 1 for Ethereum mainnet)
+        redis_url: Redis URL for the price cache, used when the client is created
+        
+    Returns:
+        BlockchainClient: The client for this endpoint
+    """
+    key = (rpc_url, chain_id)
+    with _CLIENTS_LOCK:
+        client = _CLIENTS.get(key)
+        if client is None:
+            client = BlockchainClient(rpc_url, chain_id, redis_url)
+            _CLIENTS[key] = client
+        return client 
\ No newline at end of file
@@ -1,17 +1,36 @@
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
+from threading import Lock
+import asyncio
 import os
 import time
 from datetime import datetime, timedelta
 
+import aiohttp
+import orjson
 import requests
+from cachetools import TTLCache
+from cachetools.keys import hashkey
+from requests.adapters import HTTPAdapter
 from loguru import logger
 
+from ..core.runtime import fan_out
+
+
+# Sentiment metrics are reused for 30s, shared by every client in the process
+_SENTIMENT_CACHE: TTLCache = TTLCache(maxsize=256, ttl=30)
+_SENTIMENT_CACHE_LOCK = Lock()
+
 
 class TwitterClient:
     """Client for interacting with Twitter/X API v2."""
     
     BASE_URL = "https://api.twitter.com/2"
     
+    # Sentiment searches split the timeframe into this many windows, fetched
+    # concurrently, each following up to MAX_PAGES_PER_WINDOW result pages
+    SEARCH_WINDOWS = 4
+    MAX_PAGES_PER_WINDOW = 2
+    
     def __init__(self, bearer_token: Optional[str] = None):
         """Initialize Twitter client.
         
@@ -23,25 +42,136 @@ class TwitterClient:
             raise ValueError(
                 "Twitter bearer token not provided. Set TWITTER_BEARER_TOKEN env variable."
             )
+        
+        # Pooled keep-alive session for concurrent searches
+        self.session = requests.Session()
+        self.session.headers.update(self._headers())
+        adapter = HTTPAdapter(pool_connections=8, pool_maxsize=8)
+        self.session.mount("https://", adapter)
+        
+        # Pooled aiohttp session for async searches, created on first use on
+        # the running event loop
+        self._async_session: Optional[aiohttp.ClientSession] = None
+        self._async_session_loop: Optional[asyncio.AbstractEventLoop] = None
     
     def search_recent_tweets(
         self,
         query: str,
         max_results: int = 100,
-        start_time: Optional[datetime] = None
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+        max_pages: int = 1
     ) -> List[Dict[str, Any]]:
         """Search recent tweets matching a query.
         
         Args:
             query: Search query string
-            max_results: Maximum number of tweets to return (default: 100)
+            max_results: Maximum number of tweets to return per page (default: 100)
             start_time: Only return tweets after this time
+            end_time: Only return tweets before this time
+            max_pages: Maximum number of result pages to follow (default: 1)
             
         Returns:
             List of tweet objects
         """
         url = f"{self.BASE_URL}/tweets/search/recent"
+        params = self._search_params(query, max_results, start_time, end_time)
+        tweets: List[Dict[str, Any]] = []
+        
+        try:
+            for _ in range(max_pages):
+                response = self.session.get(url, params=params)
+                response.raise_for_status()
+                data = orjson.loads(response.content)
+                
+                tweets.extend(data.get("data", []))
+                
+                next_token = data.get("meta", {}).get("next_token")
+                if not next_token:
+                    break
+                params["next_token"] = next_token
+            
+        except Exception as e:
+            logger.error(f"Error fetching tweets: {e}")
+        
+        return tweets
+    
+    async def search_recent_tweets_async(
+        self,
+        query: str,
+        max_results: int = 100,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+        max_pages: int = 1
+    ) -> List[Dict[str, Any]]:
+        """Search recent tweets matching a query without blocking the event loop.
         
+        Args:
+            query: Search query string
+            max_results: Maximum number of tweets to return per page (default: 100)
+            start_time: Only return tweets after this time
+            end_time: Only return tweets before this time
+            max_pages: Maximum number of result pages to follow (default: 1)
+            
+        Returns:
+            List of tweet objects
+        """
+        url = f"{self.BASE_URL}/tweets/search/recent"
+        params = self._search_params(query, max_results, start_time, end_time)
+        tweets: List[Dict[str, Any]] = []
+        
+        try:
+            session = self._get_async_session()
+            for _ in range(max_pages):
+                async with session.get(url, params=params) as response:
+                    response.raise_for_status()
+                    data = orjson.loads(await response.read())
+                
+                tweets.extend(data.get("data", []))
+                
+                next_token = data.get("meta", {}).get("next_token")
+                if not next_token:
+                    break
+                params["next_token"] = next_token
+            
+        except Exception as e:
+            logger.error(f"Error fetching tweets: {e}")
+        
+        return tweets
+    
+    async def close_async(self) -> None:
+        """Close the aiohttp session used by async searches, if one is open."""
+        if self._async_session is not None and not self._async_session.closed:
+            await self._async_session.close()
+        self._async_session = None
+        self._async_session_loop = None
+    
+    def _get_async_session(self) -> aiohttp.ClientSession:
+        """Get the aiohttp session for the running event loop, creating it if needed."""
+        loop = asyncio.get_running_loop()
+        if (
+            self._async_session is None
+            or self._async_session.closed
+            or self._async_session_loop is not loop
+        ):
+            self._async_session = aiohttp.ClientSession(headers=self._headers())
+            self._async_session_loop = loop
+        return self._async_session
+    
+    def _headers(self) -> Dict[str, str]:
+        """Build the authorization headers for API requests."""
+        return {
+            "Authorization": f"Bearer {self.bearer_token}"
+        }
+    
+    def _search_params(
+        self,
+        query: str,
+        max_results: int,
+        start_time: Optional[datetime],
+        end_time: Optional[datetime] = None
+    ) -> Dict[str, Any]:
+        """Build the query parameters for a recent tweet search."""
         params = {
             "query": query,
             "max_results": min(max_results, 100),  # API limit
@@ -50,21 +180,10 @@ class TwitterClient:
         
         if start_time:
             params["start_time"] = start_time.isoformat() + "Z"
+        if end_time:
+            params["end_time"] = end_time.isoformat() + "Z"
         
-        headers = {
-            "Authorization": f"Bearer {self.bearer_token}"
-        }
-        
-        try:
-            response = requests.get(url, headers=headers, params=params)
-            response.raise_for_status()
-            data = response.json()
-            
-            return data.get("data", [])
-            
-        except Exception as e:
-            logger.error(f"Error fetching tweets: {e}")
-            return []
+        return params
     
     def get_crypto_sentiment(
         self,
@@ -80,17 +199,97 @@ class TwitterClient:
         Returns:
             Dict containing sentiment metrics
         """
-        # Create search query
+        key = hashkey(symbol, timeframe_hours)
+        with _SENTIMENT_CACHE_LOCK:
+            metrics = _SENTIMENT_CACHE.get(key)
+        if metrics is not None:
+            return metrics
+        
+        query, windows = self._sentiment_query(symbol, timeframe_hours)
+        
+        # Get tweets, searching every window of the timeframe concurrently
+        results = fan_out(
+            lambda window: self.search_recent_tweets(
+                query=query,
+                max_results=100,
+                start_time=window[0],
+                end_time=window[1],
+                max_pages=self.MAX_PAGES_PER_WINDOW
+            ),
+            windows
+        )
+        tweets = [tweet for result in results for tweet in result]
+        
+        metrics = self._summarize_tweets(tweets)
+        with _SENTIMENT_CACHE_LOCK:
+            _SENTIMENT_CACHE[key] = metrics
+        return metrics
+    
+    async def get_crypto_sentiment_async(
+        self,
+        symbol: str,
+        timeframe_hours: int = 24
+    ) -> Dict[str, Any]:
+        """Get sentiment analysis for a crypto token without blocking the event loop.
+        
+        Args:
+            symbol: Token symbol (e.g., "ETH")
+            timeframe_hours: How many hours of tweets to analyze
+            
+        Returns:
+            Dict containing sentiment metrics
+        """
+        key = hashkey(symbol, timeframe_hours)
+        with _SENTIMENT_CACHE_LOCK:
+            metrics = _SENTIMENT_CACHE.get(key)
+        if metrics is not None:
+            return metrics
+        
+        query, windows = self._sentiment_query(symbol, timeframe_hours)
+        
+        # Get tweets, searching every window of the timeframe concurrently
+        results = await asyncio.gather(*[
+            self.search_recent_tweets_async(
+                query=query,
+                max_results=100,
+                start_time=start_time,
+                end_time=end_time,
+                max_pages=self.MAX_PAGES_PER_WINDOW
+            )
+            for start_time, end_time in windows
+        ])
+        tweets = [tweet for result in results for tweet in result]
+        
+        metrics = self._summarize_tweets(tweets)
+        with _SENTIMENT_CACHE_LOCK:
+            _SENTIMENT_CACHE[key] = metrics
+        return metrics
+    
+    def _sentiment_query(
+        self,
+        symbol: str,
+        timeframe_hours: int
+    ) -> Tuple[str, List[Tuple[datetime, Optional[datetime]]]]:
+        """Build the search query and time windows for a token's sentiment.
+        
+        The timeframe is split into SEARCH_WINDOWS consecutive windows. The
+        last one is left open-ended, since the API rejects end times too close
+        to the present.
+        """
         query = f"#{symbol} OR ${symbol} lang:en -is:retweet"
         start_time = datetime.utcnow() - timedelta(hours=timeframe_hours)
+        step = timedelta(hours=timeframe_hours) / self.SEARCH_WINDOWS
         
-        # Get tweets
-        tweets = self.search_recent_tweets(
-            query=query,
-            max_results=100,
-            start_time=start_time
-        )
+        windows: List[Tuple[datetime, Optional[datetime]]] = []
+        for i in range(self.SEARCH_WINDOWS):
+            window_start = start_time + step * i
+            window_end = window_start + step if i < self.SEARCH_WINDOWS - 1 else None
+            windows.append((window_start, window_end))
         
+        return query, windows
+    
+    def _summarize_tweets(self, tweets: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Compute sentiment metrics from a list of tweets."""
         if not tweets:
             return {
                 "tweet_count": 0,
@@ -100,9 +299,13 @@ class TwitterClient:
                 "sentiment_score": 0
             }
         
-        # Calculate metrics
-        total_likes = sum(t["public_metrics"]["like_count"] for t in tweets)
-        total_retweets = sum(t["public_metrics"]["retweet_count"] for t in tweets)
+        # Calculate metrics in a single pass over the tweets
+        total_likes = 0
+        total_retweets = 0
+        for tweet in tweets:
+            metrics = tweet["public_metrics"]
+            total_likes += metrics["like_count"]
+            total_retweets += metrics["retweet_count"]
         avg_engagement = (total_likes + total_retweets) / len(tweets)
         
         # Simple sentiment scoring based on engagement
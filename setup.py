@@ -35,5 +35,8 @@ setup(
             "isort>=5.12.0",
             "mypy>=1.0.0",
         ],
+        "redis": [
+            "redis>=5.0.0",
+        ],
     },
 ) 
\ No newline at end of file
@@ -0,0 +1,160 @@
+import asyncio
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from threading import Barrier, Event
+
+from agentforge.utils.blockchain import BlockchainClient
+
+WETH = "0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2"
+CALLERS = 8
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """Client with an in-process cache; constructing it makes no RPC calls."""
+    monkeypatch.delenv("REDIS_URL", raising=False)
+    return BlockchainClient("http://localhost:8545")
+
+
+@pytest.fixture
+def all_claimed(client, monkeypatch):
+    """Event set once CALLERS lookups have joined or started a price lookup."""
+    claimed = Event()
+    claims = []
+    claim_inflight = client._claim_inflight
+    
+    def counting_claim(key):
+        result = claim_inflight(key)
+        claims.append(result)
+        if len(claims) == CALLERS:
+            claimed.set()
+        return result
+    
+    monkeypatch.setattr(client, "_claim_inflight", counting_claim)
+    return claimed
+
+
+def test_concurrent_price_lookups_share_one_rpc(client, all_claimed, monkeypatch):
+    """Test that concurrent callers for one token make a single quote."""
+    quotes = []
+    
+    def quote(token_address, router, cache_key):
+        quotes.append(token_address)
+        assert all_claimed.wait(timeout=5)
+        return Decimal("1.5")
+    
+    monkeypatch.setattr(client, "_quote_price", quote)
+    with ThreadPoolExecutor(CALLERS) as pool:
+        prices = list(pool.map(lambda _: client.get_token_price_usd(WETH), range(CALLERS)))
+    
+    assert prices == [Decimal("1.5")] * CALLERS
+    assert len(quotes) == 1
+    assert client._inflight == {}
+
+
+def test_price_lookup_error_reaches_every_waiter(client, all_claimed, monkeypatch):
+    """Test that a failed quote is raised to every coalesced caller."""
+    def quote(token_address, router, cache_key):
+        assert all_claimed.wait(timeout=5)
+        raise RuntimeError("rpc down")
+    
+    monkeypatch.setattr(client, "_quote_price", quote)
+    with ThreadPoolExecutor(CALLERS) as pool:
+        futures = [pool.submit(client.get_token_price_usd, WETH) for _ in range(CALLERS)]
+        for future in futures:
+            with pytest.raises(RuntimeError, match="rpc down"):
+                future.result(timeout=5)
+    
+    assert client._inflight == {}
+
+
+def test_cancelled_price_lookup_releases_waiters(client, monkeypatch):
+    """Test that waiters on a cancelled leader are released, not left hanging."""
+    async def scenario():
+        started = asyncio.Event()
+        
+        async def quote(token_address, router, cache_key):
+            started.set()
+            await asyncio.sleep(60)
+        
+        monkeypatch.setattr(client, "_quote_price_async", quote)
+        leader = asyncio.create_task(client.get_token_price_usd_async(WETH))
+        await started.wait()
+        waiter = asyncio.create_task(client.get_token_price_usd_async(WETH))
+        await asyncio.sleep(0)
+        
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        with pytest.raises(asyncio.CancelledError):
+            await asyncio.wait_for(waiter, timeout=5)
+    
+    asyncio.run(scenario())
+    assert client._inflight == {}
+
+
+def test_price_lookup_can_bypass_cache(client, monkeypatch):
+    """Test that use_cache=False quotes afresh and refreshes the cache."""
+    quotes = iter([Decimal("1.5"), Decimal("2.5")])
+    
+    def quote(token_address, router, cache_key):
+        price = next(quotes)
+        client._set_cached_price(cache_key, price)
+        return price
+    
+    monkeypatch.setattr(client, "_quote_price", quote)
+    assert client.get_token_price_usd(WETH) == Decimal("1.5")
+    assert client.get_token_price_usd(WETH) == Decimal("1.5")
+    assert client.get_token_price_usd(WETH, use_cache=False) == Decimal("2.5")
+    assert client.get_token_price_usd(WETH) == Decimal("2.5")
+
+
+def legacy_price(amounts):
+    """USD price computed the way quotes were before the integer rewrite."""
+    price = Decimal(amounts[-1]) / Decimal(10 ** 6)
+    if len(amounts) == 3:
+        price = price / (Decimal(amounts[1]) / Decimal(10 ** 18))
+    return price
+
+
+@pytest.mark.parametrize("amounts", [
+    [10 ** 18, 3456789012],  # WETH -> USDC
+    [10 ** 6, 999873],  # Stablecoin -> USDC
+    [10 ** 18, 412345678901234567, 1456789012],  # Token -> WETH -> USDC
+    [10 ** 8, 17123456789012345678, 61234567890],  # 8-decimal token via WETH
+    [10 ** 18, 3, 7]  # Dust amounts
+])
+def test_price_from_amounts_matches_decimal_formula(client, amounts):
+    """Test that integer price math agrees with the original Decimal formula."""
+    assert client._price_from_amounts(amounts) == legacy_price(amounts)
+
+
+def test_price_path_routes_tokens_through_weth(client):
+    """Test that only tokens other than WETH are quoted via WETH."""
+    token = "0x6B175474E89094C44Da98b954EedeAC495271d0F"
+    
+    assert client._price_path(WETH) == [WETH, client.USDC]
+    assert client._price_path(token) == [token, WETH, client.USDC]
+
+
+def test_price_batch_quotes_tokens_concurrently(client, monkeypatch):
+    """Test that batch quotes run concurrently and are keyed by input address."""
+    tokens = [
+        WETH.lower(),
+        "0x6b175474e89094c44da98b954eedeac495271d0f",
+        "0x2260fac5e5542a773aa44fbcfedf7c193bc2c599",
+        "0x514910771af9ca656af840dff83e8264ecf986ca"
+    ]
+    all_quoting = Barrier(len(tokens))
+    
+    def quote(token_address, router, cache_key):
+        all_quoting.wait(timeout=5)  # Times out unless every quote is in flight
+        return Decimal(int(token_address, 16) % 1000)
+    
+    monkeypatch.setattr(client, "_quote_price", quote)
+    prices = client.get_token_price_usd_batch(tokens)
+    
+    assert list(prices) == tokens
+    assert prices == {token: Decimal(int(token, 16) % 1000) for token in tokens}
+
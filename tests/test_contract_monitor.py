@@ -0,0 +1,227 @@
+import asyncio
+import pytest
+from threading import Event
+from types import SimpleNamespace
+
+from agentforge.tasks.contract_monitor import (
+    ContractMonitorTask,
+    TRANSFER_EVENT,
+    APPROVAL_EVENT,
+    MAX_LOG_WINDOW_BLOCKS,
+    MAX_PROCESSED_TXS
+)
+
+WETH = "0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2"
+
+
+class StubLogsMonitor(ContractMonitorTask):
+    """Contract monitor whose get_logs calls are answered by the test."""
+    
+    def __init__(self, **data):
+        super().__init__(**data)
+        self.windows = []
+        self.fail_from = None  # get_logs ranges starting here or later fail
+        self.max_window = None  # Larger get_logs ranges return too many results
+    
+    def _fetch_logs(self, start_block, end_block):
+        if self.max_window is not None and end_block - start_block + 1 > self.max_window:
+            raise ValueError({
+                "code": -32005,
+                "message": "query returned more than 10000 results"
+            })
+        if self.fail_from is not None and start_block >= self.fail_from:
+            raise ConnectionError("node unavailable")
+        self.windows.append((start_block, end_block))
+        return []
+    
+    def _handle_events(self, events):
+        pass
+
+
+class RecordingEventsMonitor(ContractMonitorTask):
+    """Contract monitor recording the events it handles and receipts it fetches."""
+    
+    def __init__(self, **data):
+        super().__init__(**data)
+        self.handled = []
+        self.receipts_fetched = []
+        self.blockchain = SimpleNamespace(
+            w3=SimpleNamespace(eth=SimpleNamespace(get_transaction_receipt=self._receipt))
+        )
+    
+    def _receipt(self, tx_hash):
+        self.receipts_fetched.append(tx_hash)
+        return {"transactionHash": tx_hash}
+    
+    def _handle_event(self, event, receipt):
+        assert receipt["transactionHash"] == event["transactionHash"].hex()
+        self.handled.append(event["logIndex"])
+
+
+def make_event(tx, log_index):
+    return {"transactionHash": tx.to_bytes(32, "big"), "logIndex": log_index}
+
+
+def make_monitor(tmp_path, **data):
+    data.setdefault("events_to_monitor", [TRANSFER_EVENT])
+    return StubLogsMonitor(contract_address=WETH, state_dir=str(tmp_path), **data)
+
+
+def test_contract_monitor_cursor_stops_at_failed_window(tmp_path):
+    """Test that a failed get_logs window is not skipped by the block cursor."""
+    task = make_monitor(tmp_path, blocks_to_scan=400)
+    task._save_last_processed_block(1000)
+    task.blockchain = SimpleNamespace(w3=SimpleNamespace(eth=SimpleNamespace(block_number=1400)))
+    task._current_step = 100
+    task.fail_from = 1301
+    
+    task.execute()  # Windows 1001-1100 and 1101-1300 succeed, 1301-1400 fails
+    assert task.windows == [(1001, 1100), (1101, 1300)]
+    assert task.last_processed_block == 1300
+    
+    task.fail_from = None
+    task.execute()
+    assert task.windows[-1] == (1301, 1400)
+    assert task.last_processed_block == 1400
+    asyncio.run(task.shutdown_async())
+
+
+def test_contract_monitor_resumes_across_gap_wider_than_scan(tmp_path):
+    """Test that a cursor far behind the head is resumed without skipping blocks."""
+    task = make_monitor(tmp_path, blocks_to_scan=100)
+    task._save_last_processed_block(1000)
+    task.blockchain = SimpleNamespace(w3=SimpleNamespace(eth=SimpleNamespace(block_number=5000)))
+    
+    task.execute()
+    assert task.windows[0][0] == 1001
+    assert task.windows[-1][1] == 5000
+    for (_, previous_end), (start, _) in zip(task.windows, task.windows[1:]):
+        assert start == previous_end + 1
+    assert task.last_processed_block == 5000
+    asyncio.run(task.shutdown_async())
+
+
+def test_contract_monitor_first_run_scans_recent_blocks(tmp_path):
+    """Test that blocks_to_scan only bounds the first run without a saved cursor."""
+    task = make_monitor(tmp_path, blocks_to_scan=100)
+    task.blockchain = SimpleNamespace(w3=SimpleNamespace(eth=SimpleNamespace(block_number=5000)))
+    
+    task.execute()
+    assert task.windows[0][0] == 4900
+    assert task.windows[-1][1] == 5000
+    assert task.last_processed_block == 5000
+    asyncio.run(task.shutdown_async())
+
+
+def test_contract_monitor_state_is_keyed_by_topics(tmp_path):
+    """Test that cursor files are per topic set, lazy, and closed on shutdown."""
+    transfers = make_monitor(tmp_path, events_to_monitor=[TRANSFER_EVENT])
+    approvals = make_monitor(tmp_path, events_to_monitor=[APPROVAL_EVENT])
+    assert not any(tmp_path.iterdir())  # Nothing is written on construction
+    
+    transfers._save_last_processed_block(100)
+    approvals._save_last_processed_block(200)
+    asyncio.run(transfers.shutdown_async())
+    asyncio.run(approvals.shutdown_async())
+    assert transfers._state is None
+    
+    resumed = make_monitor(tmp_path, events_to_monitor=[TRANSFER_EVENT])
+    resumed._open_state()
+    assert resumed.last_processed_block == 100
+    asyncio.run(resumed.shutdown_async())
+
+
+def test_shutdown_waits_for_subscription_cursor_write(tmp_path):
+    """Test that shutdown lets a cursor write in a worker thread finish first."""
+    task = make_monitor(tmp_path)
+    release = Event()
+    
+    def slow_save(block_number):
+        assert release.wait(timeout=5)
+        task._save_last_processed_block(block_number)
+    
+    async def scenario():
+        task._subscription = asyncio.create_task(task._run_blocking(slow_save, 1234))
+        await asyncio.sleep(0.05)
+        shutdown = asyncio.create_task(task.shutdown_async())
+        await asyncio.sleep(0.05)
+        assert not shutdown.done()
+        release.set()
+        await asyncio.wait_for(shutdown, timeout=5)
+    
+    asyncio.run(scenario())
+    assert task._state is None  # The write didn't reopen a closed cursor file
+    
+    resumed = make_monitor(tmp_path)
+    resumed._open_state()
+    assert resumed.last_processed_block == 1234
+    asyncio.run(resumed.shutdown_async())
+
+
+def test_get_logs_adapts_window_to_result_limit(tmp_path):
+    """Test that oversized windows are split without gaps or overlaps."""
+    task = make_monitor(tmp_path, blocks_to_scan=1000)
+    task.max_window = 300
+    steps = []
+    
+    for window_end, logs in task._get_logs(5000, 9999):
+        steps.append(task._current_step)
+    
+    assert task.windows[0][0] == 5000
+    assert task.windows[-1][1] == 9999
+    for (_, previous_end), (start, _) in zip(task.windows, task.windows[1:]):
+        assert start == previous_end + 1
+    assert all(end - start + 1 <= 300 for start, end in task.windows)
+    assert all(1 <= step <= MAX_LOG_WINDOW_BLOCKS for step in steps)
+    
+    # A range the node always rejects still can't push the window below one block
+    task.max_window = 0
+    with pytest.raises(ValueError, match="more than 10000 results"):
+        list(task._get_logs(10000, 10010))
+    assert task._current_step == 1
+
+
+def test_get_logs_first_window_respects_cap(tmp_path):
+    """Test that a large blocks_to_scan doesn't exceed MAX_LOG_WINDOW_BLOCKS."""
+    task = make_monitor(tmp_path, blocks_to_scan=5 * MAX_LOG_WINDOW_BLOCKS)
+    
+    list(task._get_logs(0, 3 * MAX_LOG_WINDOW_BLOCKS))
+    assert all(end - start + 1 <= MAX_LOG_WINDOW_BLOCKS for start, end in task.windows)
+
+
+def test_processed_txs_evicts_oldest_first():
+    """Test that the processed transaction FIFO drops its oldest hashes first."""
+    task = RecordingEventsMonitor(contract_address=WETH, events_to_monitor=[TRANSFER_EVENT])
+    overflow = 5
+    
+    task._handle_events([make_event(tx, tx) for tx in range(MAX_PROCESSED_TXS + overflow)])
+    assert len(task.processed_txs) == MAX_PROCESSED_TXS
+    assert next(iter(task.processed_txs)) == make_event(overflow, 0)["transactionHash"].hex()
+    
+    # Evicted transactions are handled again; remembered ones are not
+    task.handled.clear()
+    task._handle_events([make_event(0, 0), make_event(overflow, 1)])
+    assert task.handled == [0]
+
+
+def test_handle_events_fetches_one_receipt_per_new_tx():
+    """Test that duplicate-tx events share one receipt and keep log order."""
+    task = RecordingEventsMonitor(contract_address=WETH, events_to_monitor=[TRANSFER_EVENT])
+    task._handle_events([make_event(1, 0)])
+    task.receipts_fetched.clear()
+    task.handled.clear()
+    
+    events = [
+        make_event(2, 1),
+        make_event(3, 2),
+        make_event(2, 3),  # Same transaction as log 1
+        make_event(1, 4),  # Already processed
+        make_event(4, 5),
+        make_event(3, 6)
+    ]
+    task._handle_events(events)
+    
+    assert sorted(task.receipts_fetched) == sorted(
+        make_event(tx, 0)["transactionHash"].hex() for tx in (2, 3, 4)
+    )
+    assert task.handled == [1, 2, 5]
@@ -1,10 +1,28 @@
 import pytest
 from decimal import Decimal
+from threading import Barrier, Event
 
-from agentforge.core import Agent
+from agentforge.core import Agent, runtime
 from agentforge.tasks.base import Task
 from agentforge.tasks.price_tracking import PriceTrackingTask
 
+WETH = "0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2"
+
+
+class RecordingTask(Task):
+    """Task that records its runs instead of doing any I/O."""
+    
+    name: str = "recording"
+    
+    def __init__(self, **data):
+        super().__init__(**data)
+        self.runs = 0
+        self.ran = Event()
+    
+    def execute(self) -> None:
+        self.runs += 1
+        self.ran.set()
+
 
 def test_agent_initialization():
     """Test that an agent can be properly initialized."""
@@ -17,7 +35,7 @@ def test_agent_task_assignment():
     """Test that tasks can be assigned to an agent."""
     agent = Agent("test_agent")
     task = PriceTrackingTask(
-        token_address="0x123",
+        token_address=WETH,
         threshold_price=Decimal("100.00")
     )
     
@@ -26,13 +44,36 @@ def test_agent_task_assignment():
     assert isinstance(agent.tasks[0], Task)
 
 
+def test_task_rejects_invalid_address():
+    """Test that tasks validate their addresses when constructed."""
+    with pytest.raises(ValueError, match="Invalid Ethereum address"):
+        PriceTrackingTask(
+            token_address="0x123",
+            threshold_price=Decimal("100.00")
+        )
+
+
+def test_agent_schedules_task_interval():
+    """Test that each assigned task is scheduled on its own interval."""
+    agent = Agent("test_agent")
+    task = RecordingTask(interval_seconds=30)
+    
+    agent.assign_task(task)
+    agent.start()
+    try:
+        assert len(agent._jobs) == 1
+        assert agent._jobs[0].trigger.interval.total_seconds() == 30
+        assert task.ran.wait(timeout=5)  # First run fires immediately
+    finally:
+        agent.stop()
+    assert len(agent._jobs) == 0
+    assert task.runs == 1
+
+
 def test_agent_start_stop():
     """Test that an agent can be started and stopped."""
     agent = Agent("test_agent")
-    task = PriceTrackingTask(
-        token_address="0x123",
-        threshold_price=Decimal("100.00")
-    )
+    task = RecordingTask()
     
     agent.assign_task(task)
     agent.start()
@@ -40,3 +81,18 @@ def test_agent_start_stop():
     
     agent.stop()
     assert agent._running is False 
+
+
+def test_fan_out_runs_nested_calls_on_saturated_pool():
+    """Test that fan_out from every pool worker at once can't deadlock the pool."""
+    workers = runtime._POOL._max_workers
+    all_busy = Barrier(workers)
+    
+    def outer(i):
+        all_busy.wait(timeout=5)  # Every worker is now blocked in a caller
+        return runtime.fan_out(lambda j: i * 10 + j, range(3))
+    
+    results = [runtime._POOL.submit(outer, i) for i in range(workers)]
+    assert [future.result(timeout=5) for future in results] == [
+        [i * 10, i * 10 + 1, i * 10 + 2] for i in range(workers)
+    ]
@@ -0,0 +1,164 @@
+import asyncio
+import pytest
+from datetime import timedelta
+from types import SimpleNamespace
+
+import orjson
+
+from agentforge.utils import twitter
+from agentforge.utils.twitter import TwitterClient
+
+TWEETS = [
+    {"id": "1", "public_metrics": {"like_count": 10, "retweet_count": 2}},
+    {"id": "2", "public_metrics": {"like_count": 4, "retweet_count": 0}}
+]
+
+# Result pages keyed by the next_token that requests them
+PAGES = {
+    None: {"data": [TWEETS[0]], "meta": {"next_token": "page-2"}},
+    "page-2": {"data": [TWEETS[1]], "meta": {}}
+}
+
+
+@pytest.fixture(autouse=True)
+def clear_sentiment_cache():
+    twitter._SENTIMENT_CACHE.clear()
+    yield
+    twitter._SENTIMENT_CACHE.clear()
+
+
+@pytest.fixture
+def client():
+    return TwitterClient("test-token")
+
+
+@pytest.fixture
+def requested(client, monkeypatch):
+    """next_token of every page the client's session requests."""
+    tokens = []
+    
+    def get(url, params=None):
+        tokens.append(params.get("next_token"))
+        content = orjson.dumps(PAGES[params.get("next_token")])
+        return SimpleNamespace(content=content, raise_for_status=lambda: None)
+    
+    monkeypatch.setattr(client.session, "get", get)
+    return tokens
+
+
+class FakeResponse:
+    """aiohttp response serving one result page."""
+    
+    def __init__(self, page):
+        self._page = page
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        pass
+    
+    def raise_for_status(self):
+        pass
+    
+    async def read(self):
+        return orjson.dumps(self._page)
+
+
+class FakeSession:
+    """aiohttp session recording the next_token of every page requested."""
+    
+    requested = []
+    created = []
+    
+    def __init__(self, headers=None):
+        self.closed = False
+        self.created.append(self)
+    
+    async def close(self):
+        self.closed = True
+    
+    def get(self, url, params=None):
+        self.requested.append(params.get("next_token"))
+        return FakeResponse(PAGES[params.get("next_token")])
+
+
+def test_sentiment_query_splits_timeframe(client):
+    """Test that the timeframe is split into contiguous, open-ended windows."""
+    query, windows = client._sentiment_query("ETH", 24)
+    
+    assert query == "#ETH OR $ETH lang:en -is:retweet"
+    assert len(windows) == TwitterClient.SEARCH_WINDOWS
+    for (_, previous_end), (start, _) in zip(windows, windows[1:]):
+        assert start == previous_end
+    for start, end in windows[:-1]:
+        assert end - start == timedelta(hours=24) / TwitterClient.SEARCH_WINDOWS
+    assert windows[-1][1] is None
+
+
+def test_search_follows_next_token(client, requested):
+    """Test that result pages are followed until no next_token is returned."""
+    tweets = client.search_recent_tweets("#ETH", max_pages=5)
+    
+    assert tweets == TWEETS
+    assert requested == [None, "page-2"]
+
+
+def test_search_stops_at_max_pages(client, requested):
+    """Test that no more than max_pages result pages are requested."""
+    tweets = client.search_recent_tweets("#ETH", max_pages=1)
+    
+    assert tweets == TWEETS[:1]
+    assert requested == [None]
+
+
+def test_search_follows_next_token_async(client, monkeypatch):
+    """Test that the async search follows result pages like the sync one."""
+    monkeypatch.setattr(twitter.aiohttp, "ClientSession", FakeSession)
+    monkeypatch.setattr(FakeSession, "requested", [])
+    monkeypatch.setattr(FakeSession, "created", [])
+    
+    async def search():
+        try:
+            return await client.search_recent_tweets_async("#ETH", max_pages=5)
+        finally:
+            await client.close_async()
+    
+    tweets = asyncio.run(search())
+    
+    assert tweets == TWEETS
+    assert FakeSession.requested == [None, "page-2"]
+
+
+def test_sentiment_is_cached(client, requested):
+    """Test that repeated sentiment lookups are served from the cache."""
+    metrics = client.get_crypto_sentiment("ETH")
+    
+    # Every window follows both result pages
+    assert len(requested) == 2 * TwitterClient.SEARCH_WINDOWS
+    assert metrics["tweet_count"] == 2 * TwitterClient.SEARCH_WINDOWS
+    assert metrics["total_likes"] == 14 * TwitterClient.SEARCH_WINDOWS
+    
+    assert client.get_crypto_sentiment("ETH") == metrics
+    assert asyncio.run(client.get_crypto_sentiment_async("ETH")) == metrics
+    assert len(requested) == 2 * TwitterClient.SEARCH_WINDOWS
+
+
+def test_async_sentiment_shares_one_session(client, monkeypatch):
+    """Test that every search window of a sentiment run reuses one session."""
+    monkeypatch.setattr(twitter.aiohttp, "ClientSession", FakeSession)
+    monkeypatch.setattr(FakeSession, "requested", [])
+    monkeypatch.setattr(FakeSession, "created", [])
+    
+    async def sentiment():
+        try:
+            return await client.get_crypto_sentiment_async("ETH")
+        finally:
+            await client.close_async()
+    
+    metrics = asyncio.run(sentiment())
+    
+    assert metrics["tweet_count"] == 2 * TwitterClient.SEARCH_WINDOWS
+    assert len(FakeSession.requested) == 2 * TwitterClient.SEARCH_WINDOWS
+    assert len(FakeSession.created) == 1
+    assert FakeSession.created[0].closed